@@ -2,7 +2,7 @@ from .config import OAuth2Config
 from .api_client import APIClient, new_api_client
 from .api_client_async import APIClientAsync, new_api_client_async
 from .token_manager import TokenManager
-from .token_manager_async import TokenManagerAsync
+from .token_manager_async import TokenManagerAsync, refresh_all
 
 __all__ = [
     'OAuth2Config',
@@ -11,5 +11,6 @@ __all__ = [
     'APIClientAsync',
     'new_api_client_async',
     'TokenManager',
-    'TokenManagerAsync'
+    'TokenManagerAsync',
+    'refresh_all'
 ]
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Pooled HTTP clients shared by the API clients of an event loop and their token managers.
+"""
+import asyncio
+import weakref
+from typing import Any, Dict, List
+
+import httpx
+
+# HTTP/2 needs the optional h2 package; without it clients stay on HTTP/1.1.
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - h2 is an optional dependency
+    HTTP2_AVAILABLE = False
+
+# Pooled HTTP clients per event loop, keyed by whether HTTP/2 is enabled, with the number
+# of API clients holding each of them. Token refreshes and API calls share them, so
+# requests to the same host reuse its connections, and with them the DNS lookups and TLS
+# sessions.
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, List[Any]]]" = weakref.WeakKeyDictionary()
+
+
+def new_client(http2: bool) -> httpx.AsyncClient:
+    """
+    Create an HTTP client with a keep-alive connection pool.
+
+    Args:
+        http2 (bool): Whether to negotiate HTTP/2 when h2 is installed.
+
+    Returns:
+        httpx.AsyncClient: A new HTTP client.
+    """
+    limits = httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30)
+    transport = httpx.AsyncHTTPTransport(retries=1, limits=limits, http2=http2 and HTTP2_AVAILABLE)
+    return httpx.AsyncClient(follow_redirects=True, transport=transport)
+
+
+def acquire_client(http2: bool) -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client for the running event loop, creating it on first use.
+
+    Each call takes a reference to the client that must be given back with `release_client`.
+
+    Args:
+        http2 (bool): Whether to negotiate HTTP/2 when h2 is installed.
+
+    Returns:
+        httpx.AsyncClient: The shared HTTP client.
+    """
+    entries = _shared_clients.setdefault(asyncio.get_running_loop(), {})
+    entry = entries.get(http2)
+    if entry is None or entry[0].is_closed:
+        entry = entries[http2] = [new_client(http2), 0]
+    entry[1] += 1
+    return entry[0]
+
+
+def _drop_reference(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> bool:
+    """Drop a reference to the shared HTTP client of an event loop and return True if it was the last one."""
+    entries = _shared_clients.get(loop, {})
+    for http2, entry in entries.items():
+        if entry[0] is client:
+            entry[1] -= 1
+            if entry[1] > 0:
+                return False
+            del entries[http2]
+            if not entries:
+                del _shared_clients[loop]
+            return True
+    return False
+
+
+async def release_client(client: httpx.AsyncClient):
+    """
+    Give back a reference taken with `acquire_client`, closing the client with the last one.
+
+    Args:
+        client (httpx.AsyncClient): The shared HTTP client.
+    """
+    if _drop_reference(asyncio.get_running_loop(), client):
+        await client.aclose()
+
+
+def discard_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+    """
+    Give back a reference taken with `acquire_client` on another event loop than the running one.
+
+    This is for holders that have moved on to a new event loop, for example after the
+    previous one was closed by `asyncio.run`.
+
+    Args:
+        client (httpx.AsyncClient): The shared HTTP client.
+        loop (asyncio.AbstractEventLoop): The event loop the reference was taken on.
+    """
+    if _drop_reference(loop, client):
+        close_on_loop(client, loop)
+
+
+def close_on_loop(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+    """
+    Close an HTTP client from outside the event loop its connections belong to.
+
+    The client is closed on that loop if it is still open. Once the loop is closed its
+    connections can no longer be closed cleanly and are left to the garbage collector.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client.
+        loop (asyncio.AbstractEventLoop): The event loop the client was used on.
+    """
+    if not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
@@ -0,0 +1,46 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the standard library.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to JSON.
+
+    Args:
+        obj (Any): The object to serialize.
+        indent (bool, optional): Pretty-print with an indentation of two spaces. Defaults to False.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Args:
+        data (bytes): The UTF-8 encoded JSON document. An empty document decodes to None.
+
+    Returns:
+        Any: The decoded object.
+    """
+    if not data:
+        return None
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,19 +2,104 @@
 A synchronous client for making authenticated API calls using OAuth2.
 """
 import asyncio
-from typing import Dict, Any, Optional, Union, Tuple
+import concurrent.futures
+import os
+import sys
+import threading
+from typing import Dict, Any, Optional, Union, Tuple, Coroutine, Iterable, List
 from pathlib import Path
 from .config import OAuth2Config
 
 from .api_client_async import APIClientAsync
-from .token_manager import TokenManager
+from .token_manager import TokenManager, _run_loop_in_thread
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create an event loop, using uvloop when it is installed.
+
+    Set the `OAUTH2_CLIENT_NO_UVLOOP=1` environment variable to use the standard asyncio loop.
+    """
+    if sys.platform != "win32" and os.environ.get("OAUTH2_CLIENT_NO_UVLOOP") != "1":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+class _LoopThread:
+    """
+    An asyncio event loop running forever in a daemon thread.
+
+    All APIClient instances in the process run their calls on this loop, so they
+    share one event loop and one HTTP connection pool.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop, started on first use and running by the time it is returned."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = _new_event_loop()
+                    _run_loop_in_thread(loop, "oauth2-client-loop")
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return a future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+_loop_thread = _LoopThread()
+
+class _AsyncClientPool:
+    """
+    Reference-counted APIClientAsync instances, shared by all APIClient instances
+    created with the same configuration object and base URL.
+
+    Clients sharing an APIClientAsync also share its token, so they refresh it once.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, int], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, config: Optional[OAuth2Config], base_url: str) -> APIClientAsync:
+        """Return the shared client for a configuration and base URL, creating it if needed."""
+        key = (base_url, id(config))
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                entry = self._clients[key] = [APIClientAsync(config, base_url), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, config: Optional[OAuth2Config], base_url: str) -> bool:
+        """Drop a reference to a shared client and return True if it was the last one."""
+        key = (base_url, id(config))
+        with self._lock:
+            entry = self._clients[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._clients[key]
+                return True
+            return False
+
+_client_pool = _AsyncClientPool()
 
 class APIClient:
     """
     Client for making authenticated API calls using OAuth2.
 
     This class provides a synchronous interface for API calls, internally using
-    an asynchronous client.
+    an asynchronous client. The calls of all instances run on one event loop in
+    a background thread, and instances created with the same config object and
+    base URL share one asynchronous client and its token.
 
     Attributes:
         token_manager (TokenManager): Manages OAuth2 tokens synchronously.
@@ -29,9 +114,13 @@ class APIClient:
             config (Optional[OAuth2Config]): OAuth2 configuration. If None, no authentication is used.
             base_url (str): The base URL for API calls.
         """
-        self._loop = asyncio.new_event_loop()
-        self.async_client = self._loop.run_until_complete(APIClientAsync(config, base_url).__aenter__())
-        self.token_manager = TokenManager(self.async_client.token_manager, self._loop)
+        self._config = config
+        self.async_client = _client_pool.acquire(config, base_url)
+        self.token_manager = TokenManager(self.async_client.token_manager, _loop_thread.loop)
+        self._closed = False
+        # Bound once to save two attribute lookups on every call
+        self._submit = _loop_thread.submit
+        self._call_api = self.async_client.call_api
 
     def call_api(self, method: str, path: str, body: Any = None, additional_headers: Optional[Dict[str, str]] = None) -> Tuple[Union[bytes, str, Dict], int, str]:
         """
@@ -52,7 +141,33 @@ class APIClient:
             print(f"Status: {status}, Content-Type: {content_type}, Response: {response}")
             ```
         """
-        return self._loop.run_until_complete(self.async_client.call_api(method, path, body, additional_headers))
+        return self._submit(self._call_api(method, path, body, additional_headers)).result()
+
+    def call_api_many(self, requests: Iterable[Tuple], concurrency: int = 32) -> List[Tuple[Union[bytes, str, Dict], int, str]]:
+        """
+        Make many API calls concurrently.
+
+        Args:
+            requests (Iterable[Tuple]): The calls to make, each a tuple of `call_api` arguments:
+                `(method, path)`, `(method, path, body)` or `(method, path, body, additional_headers)`.
+            concurrency (int, optional): Maximum number of calls in flight at once. Defaults to 32.
+
+        Returns:
+            List[Tuple[Union[bytes, str, Dict], int, str]]: Response body, status code, and content type
+                of each call, in the order of `requests`.
+
+        Raises:
+            APIError: If any of the API calls fails.
+            ValueError: If `concurrency` is less than 1.
+
+        Example:
+            ```python
+            results = client.call_api_many([("GET", f"/users/{i}") for i in range(100)])
+            for response, status, content_type in results:
+                print(f"Status: {status}, Response: {response}")
+            ```
+        """
+        return self._submit(self.async_client.call_api_many(requests, concurrency)).result()
 
     def download_file(self, method: str, path: str, body: Any = None, additional_headers: Optional[Dict[str, str]] = None, dest_path: Optional[Union[str, Path]] = None) -> Union[str, bytes]:
         """
@@ -74,16 +189,21 @@ class APIClient:
             print(result)
             ```
         """
-        return self._loop.run_until_complete(self.async_client.download_file(method, path, body, additional_headers, dest_path))
+        return self._submit(self.async_client.download_file(method, path, body, additional_headers, dest_path)).result()
 
     def close(self):
         """
         Close the client and its underlying resources.
 
-        This method should be called when the client is no longer needed.
+        This method should be called when the client is no longer needed. The
+        underlying asynchronous client is closed once every APIClient sharing it
+        has been closed.
         """
-        self._loop.run_until_complete(self.async_client.__aexit__(None, None, None))
-        self._loop.close()
+        if self._closed:
+            return
+        self._closed = True
+        if _client_pool.release(self._config, self.async_client.base_url):
+            self._submit(self.async_client.__aexit__(None, None, None)).result()
 
     def __enter__(self):
         """
@@ -1,16 +1,126 @@
 """
 Asynchronous client for making authenticated API calls using OAuth2.
 """
-import json
-from typing import Dict, Any, Optional, Union, Tuple
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Union, Tuple, AsyncIterator, Iterable, List, Callable
 from urllib.parse import urlencode
 from pathlib import Path
 
+import aiofiles
 import httpx
 
 from .config import OAuth2Config
 from .token_manager_async import TokenManagerAsync
 from .exceptions import APIError
+from . import _http, _json
+
+# Size of the chunks in which downloads are written to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _encode_mapping(body: Dict, content_type: str) -> Any:
+    """Encode a dict body according to the request content type."""
+    if content_type == "application/json":
+        return _json.dumps(body)
+    if content_type == "application/x-www-form-urlencoded":
+        return urlencode(body)
+    return body
+
+
+# Request body encoders and their default content types, looked up by the exact body type.
+# A None encoder sends the body as is.
+_BODY_ENCODERS: Dict[type, Tuple[Optional[Callable[[Any, str], Any]], str]] = {
+    dict: (_encode_mapping, "application/json"),
+    str: (None, "text/plain"),
+    bytes: (None, "application/octet-stream"),
+}
+
+
+def _find_body_encoder(body: Any) -> Optional[Tuple[Optional[Callable[[Any, str], Any]], str]]:
+    """Find the encoder for a body whose type is a subclass of a known body type."""
+    for body_type, encoder in _BODY_ENCODERS.items():
+        if isinstance(body, body_type):
+            return encoder
+    return None
+
+
+def _prepare_request(
+    base_url: str,
+    path: str,
+    body: Any,
+    additional_headers: Optional[Dict[str, str]],
+    auth_header: Optional[bytes],
+) -> Tuple[str, Any, Dict[str, Any]]:
+    """
+    Build the URL, content and headers of a request.
+
+    This is the synchronous, fully annotated part of every API call; all I/O such as
+    fetching the token happens in the caller.
+
+    Args:
+        base_url (str): The base URL for API calls.
+        path (str): API endpoint path.
+        body (Any): Request body.
+        additional_headers (Optional[Dict[str, str]]): Additional HTTP headers.
+        auth_header (Optional[bytes]): Authorization header value, or None when no authentication is used.
+
+    Returns:
+        Tuple[str, Any, Dict[str, Any]]: Request URL, content, and headers.
+    """
+    # Build the headers in a single dict display rather than copying and then mutating
+    headers: Dict[str, Any]
+    if auth_header is not None:
+        headers = {**additional_headers, "Authorization": auth_header} if additional_headers else {"Authorization": auth_header}
+    else:
+        headers = {**additional_headers} if additional_headers else {}
+
+    content = body
+    if body is not None:
+        encoder = _BODY_ENCODERS.get(type(body)) or _find_body_encoder(body)
+        if encoder is not None:
+            encode, default_content_type = encoder
+            content_type = headers.setdefault("Content-Type", default_content_type)
+            if encode is not None:
+                content = encode(body, content_type)
+
+    return base_url + path, content, headers
+
+
+def _decode_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body."""
+    return _json.loads(response.content)
+
+
+def _decode_text(response: httpx.Response) -> str:
+    """Decode a text response body using its declared charset."""
+    return response.text
+
+
+def _decode_bytes(response: httpx.Response) -> bytes:
+    """Return a binary response body as is."""
+    return response.content
+
+
+# Response body decoders, looked up by media type
+_RESPONSE_DECODERS = {
+    "application/json": _decode_json,
+    "text/plain": _decode_text,
+    "text/html": _decode_text,
+    "text/csv": _decode_text,
+    "text/xml": _decode_text,
+    "application/octet-stream": _decode_bytes,
+}
+
+
+def _response_decoder(content_type: str):
+    """Find the decoder for a response with the given Content-Type header."""
+    media_type = content_type.partition(";")[0].strip().lower()
+    decoder = _RESPONSE_DECODERS.get(media_type)
+    if decoder is None:
+        decoder = _decode_text if media_type.startswith("text/") else _decode_bytes
+    return decoder
+
 
 class APIClientAsync:
     """
@@ -22,7 +132,9 @@ class APIClientAsync:
     Attributes:
         base_url (str): The base URL for API calls.
         token_manager (TokenManager): Manages OAuth2 tokens.
-        http_client (httpx.AsyncClient): Asynchronous HTTP client.
+        http_client (httpx.AsyncClient): Asynchronous HTTP client. Unless `shared_pool` is
+            disabled in the config, this is a connection pool shared by all clients
+            running on the same event loop.
 
     Example:
         ```python
@@ -41,8 +153,51 @@ class APIClientAsync:
             base_url (str): The base URL for API calls.
         """
         self.base_url = base_url
-        self.token_manager = TokenManagerAsync(config) if config else None
-        self.http_client = httpx.AsyncClient(follow_redirects=True)
+        self._http2 = config.http2 if config else True
+        self._http_client = None if config is None or config.shared_pool else _http.new_client(self._http2)
+        # The shared pool of the event loop, held from the first call until `close`
+        self._pooled_client: Optional[httpx.AsyncClient] = None
+        self._pooled_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Token requests go through the same pool as API calls, usually to the same host
+        self.token_manager = TokenManagerAsync(config, self._http_client) if config else None
+        if self.token_manager is not None and self._http_client is None:
+            self.token_manager._client_provider = lambda: self.http_client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        The HTTP client used for API calls.
+
+        Assign an `httpx.AsyncClient` to use it instead of the shared connection pool, for
+        example with a custom transport. The assigned client is closed by `close`.
+
+        The shared connection pool is that of the running event loop. When the client is
+        used on another event loop than before, for example in successive `asyncio.run`
+        calls, the pool of the previous loop is given back and that of the new one is used.
+
+        Raises:
+            RuntimeError: If the shared connection pool is read outside a running event loop,
+                since each event loop has its own pool.
+        """
+        if self._http_client is not None:
+            return self._http_client
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            raise RuntimeError(
+                "The shared connection pool of an event loop can only be used inside that loop; "
+                "assign http_client or set shared_pool=False in OAuth2Config to use a client of your own"
+            ) from None
+        if self._pooled_client is None or self._pooled_loop is not loop or self._pooled_client.is_closed:
+            if self._pooled_client is not None and self._pooled_loop is not None and self._pooled_loop is not loop:
+                _http.discard_client(self._pooled_client, self._pooled_loop)
+            self._pooled_client = _http.acquire_client(self._http2)
+            self._pooled_loop = loop
+        return self._pooled_client
+
+    @http_client.setter
+    def http_client(self, client: httpx.AsyncClient):
+        self._http_client = client
 
     async def call_api(self, method: str, path: str, body: Any = None, additional_headers: Optional[Dict[str, str]] = None) -> Tuple[Union[bytes, str, Dict], int, str]:
         """
@@ -58,7 +213,9 @@ class APIClientAsync:
             Tuple[Union[bytes, str, Dict], int, str]: Response body, status code, and content type.
 
         Raises:
-            APIError: If the API call fails.
+            APIError: If the API call fails. A call rejected with 401 Unauthorized is retried
+                once with a refreshed token before failing, unless its body is a one-shot
+                stream that cannot be sent again.
 
         Example:
             ```python
@@ -66,61 +223,128 @@ class APIClientAsync:
             print(f"Status: {status}, Content-Type: {content_type}, Response: {response}")
             ```
         """
-        headers = additional_headers.copy() if additional_headers else {}
-        
-        if self.token_manager:
-            token = await self.token_manager.get_valid_token()
-            headers["Authorization"] = f"Bearer {token}"
-
-        content_type = headers.get("Content-Type")
-
-        if body is not None:
-            if isinstance(body, dict):
-                if content_type is None:
-                    headers["Content-Type"] = "application/json"
-                    data = json.dumps(body)
-                elif content_type == "application/x-www-form-urlencoded":
-                    data = urlencode(body)
-                elif content_type == "application/json":
-                    data = json.dumps(body)
-                else:
-                    data = body
-            elif isinstance(body, str):
-                if content_type is None:
-                    headers["Content-Type"] = "text/plain"
-                data = body
-            elif isinstance(body, bytes):
-                if content_type is None:
-                    headers["Content-Type"] = "application/octet-stream"
-                data = body
-            else:
-                data = body
-        else:
-            data = None
+        response, auth_header = await self._send(method, path, body, additional_headers)
+        # A 401 can mean the token was revoked before its reported expiry, so the call
+        # is retried once with a freshly refreshed token.
+        if self._invalidate_rejected_token(response, auth_header, body):
+            response, _ = await self._send(method, path, body, additional_headers)
 
         try:
-            response = await self.http_client.request(
-                method, 
-                self.base_url + path, 
-                content=data, 
-                headers=headers
-            )
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
             raise APIError(f"API call failed: {e}") from e
 
+        return self._parse_response(response)
+
+    async def _send(self, method: str, path: str, body: Any, additional_headers: Optional[Dict[str, str]]) -> Tuple[httpx.Response, Optional[bytes]]:
+        """Send a request and return the response with the Authorization header value it was sent with."""
+        # Unauthenticated clients skip the token manager without creating a coroutine
+        auth_header = await self.token_manager.get_auth_header_bytes() if self.token_manager else None
+        url, content, headers = _prepare_request(self.base_url, path, body, additional_headers, auth_header)
+        response = await self.http_client.request(
+            method, 
+            url, 
+            content=content, 
+            headers=headers
+        )
+        return response, auth_header
+
+    async def call_api_many(self, requests: Iterable[Tuple], concurrency: int = 32) -> List[Tuple[Union[bytes, str, Dict], int, str]]:
+        """
+        Make many authenticated API calls concurrently.
+
+        The token is fetched once up front and at most `concurrency` calls are in flight
+        at a time, all sharing the client's connection pool.
+
+        Args:
+            requests (Iterable[Tuple]): The calls to make, each a tuple of `call_api` arguments:
+                `(method, path)`, `(method, path, body)` or `(method, path, body, additional_headers)`.
+            concurrency (int, optional): Maximum number of calls in flight at once. Defaults to 32.
+
+        Returns:
+            List[Tuple[Union[bytes, str, Dict], int, str]]: Response body, status code, and content type
+                of each call, in the order of `requests`.
+
+        Raises:
+            APIError: If any of the API calls fails. The calls still in flight are cancelled.
+            ValueError: If `concurrency` is less than 1.
+
+        Example:
+            ```python
+            results = await client.call_api_many([("GET", f"/users/{i}") for i in range(100)])
+            for response, status, content_type in results:
+                print(f"Status: {status}, Response: {response}")
+            ```
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(requests):
+            queue.put_nowait(item)
+        results: List[Any] = [None] * queue.qsize()
+
+        if self.token_manager:
+            await self.token_manager.get_valid_token()
+
+        async def worker():
+            while not queue.empty():
+                index, args = queue.get_nowait()
+                results[index] = await self.call_api(*args)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(results)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return results
+
+    def _invalidate_rejected_token(self, response: httpx.Response, auth_header: Optional[bytes], body: Any) -> bool:
+        """
+        Invalidate the token if the server rejected it, and return whether the request should be retried.
+
+        Only requests whose body can be sent again are retried; a one-shot stream, such as
+        an async generator, has already been consumed by the first attempt.
+        """
+        if response.status_code != 401 or auth_header is None or self.token_manager is None:
+            return False
+        if body is not None and not isinstance(body, (bytes, str, dict)):
+            return False
+        self.token_manager.invalidate(auth_header[len(b"Bearer "):].decode("ascii"))
+        return True
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Tuple[Union[bytes, str, Dict], int, str]:
+        """Decode a response body according to its content type."""
         content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type:
-            return response.json(), response.status_code, content_type
-        elif "text/" in content_type:
-            return response.text, response.status_code, content_type
-        else:
-            return response.content, response.status_code, content_type
+        return _response_decoder(content_type)(response), response.status_code, content_type
+
+    @asynccontextmanager
+    async def _stream_request(self, method: str, path: str, body: Any, additional_headers: Optional[Dict[str, str]]) -> AsyncIterator[httpx.Response]:
+        """Send a request and yield the response before its body has been read."""
+        for attempt in range(2):
+            auth_header = await self.token_manager.get_auth_header_bytes() if self.token_manager else None
+            url, content, headers = _prepare_request(self.base_url, path, body, additional_headers, auth_header)
+            async with self.http_client.stream(method, url, content=content, headers=headers) as response:
+                if attempt == 0 and self._invalidate_rejected_token(response, auth_header, body):
+                    continue
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    raise APIError(f"API call failed: {e}") from e
+                yield response
+                return
 
     async def download_file(self, method: str, path: str, body: Any = None, additional_headers: Optional[Dict[str, str]] = None, dest_path: Optional[Union[str, Path]] = None) -> Union[str, bytes]:
         """
         Download a file from the API.
 
+        When `dest_path` is given, the response body is streamed to disk in chunks
+        rather than loaded into memory, and the writes run in a worker thread so
+        they do not block the event loop. JSON responses are saved pretty-printed.
+
         Args:
             method (str): HTTP method (usually "GET").
             path (str): API endpoint path.
@@ -137,23 +361,41 @@ class APIClientAsync:
             print(result)
             ```
         """
-        content, _, _ = await self.call_api(method, path, body, additional_headers)
+        async with self._stream_request(method, path, body, additional_headers) as response:
+            if not dest_path:
+                await response.aread()
+                content, _, _ = self._parse_response(response)
+                return content
 
-        if dest_path:
             dest_path = Path(dest_path)
-            if isinstance(content, str):
-                dest_path.write_text(content, encoding="utf-8")
-            elif isinstance(content, bytes):
-                dest_path.write_bytes(content)
-            else:  # For JSON content
-                dest_path.write_text(json.dumps(content, indent=2), encoding="utf-8")
+            if _response_decoder(response.headers.get("Content-Type", "")) is _decode_json:
+                content = _json.loads(await response.aread())
+                async with aiofiles.open(dest_path, "wb") as f:
+                    await f.write(_json.dumps(content, indent=True))
+            else:
+                async with aiofiles.open(dest_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
             return f"{dest_path}"
-        else:
-            return content
 
     async def close(self):
-        """Close the HTTP client session."""
-        await self.http_client.aclose()
+        """
+        Close the HTTP client session.
+
+        The shared connection pool is closed once the last client using it on this event
+        loop is closed.
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._pooled_client is not None and self._pooled_loop is not None:
+            pooled_client, self._pooled_client = self._pooled_client, None
+            pooled_loop, self._pooled_loop = self._pooled_loop, None
+            if pooled_loop is asyncio.get_running_loop():
+                await _http.release_client(pooled_client)
+            else:
+                _http.discard_client(pooled_client, pooled_loop)
+        if self.token_manager:
+            await self.token_manager.aclose()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -2,7 +2,8 @@
 This module contains the configuration class for OAuth2 authentication.
 """
 from dataclasses import dataclass
-from typing import List
+from pathlib import Path
+from typing import List, Optional, Union
 
 @dataclass
 class OAuth2Config:
@@ -17,6 +18,14 @@ class OAuth2Config:
         client_id (str): The client ID for OAuth2 authentication.
         client_secret (str): The client secret for OAuth2 authentication.
         scopes (List[str]): A list of scopes to request for the OAuth2 token.
+        shared_pool (bool): Whether API clients share one process-wide HTTP connection
+            pool per event loop. Set to False to give each client its own pool.
+        http2 (bool): Whether to negotiate HTTP/2 with servers that support it, so that
+            concurrent requests to the same host are multiplexed over one connection.
+            Requires the `http2` extra; without it HTTP/1.1 is used.
+        cache_path (Optional[Union[str, Path]]): A directory in which to persist the access
+            token, so that a new process reuses it until it expires instead of requesting
+            a new one. The token is not persisted when this is None.
 
     Example:
         ```python
@@ -32,4 +41,7 @@ class OAuth2Config:
     token_url: str
     client_id: str
     client_secret: str
-    scopes: List[str]
\ No newline at end of file
+    scopes: List[str]
+    shared_pool: bool = True
+    http2: bool = True
+    cache_path: Optional[Union[str, Path]] = None
@@ -2,15 +2,35 @@
 A synchronous wrapper for the asynchronous TokenManagerAsync class.
 """
 import asyncio
+import threading
+import time
+from typing import Any, Coroutine, Optional, TypeVar
 from .token_manager_async import TokenManagerAsync
 
+_T = TypeVar("_T")
+
+def _run_loop_in_thread(loop: asyncio.AbstractEventLoop, name: str) -> threading.Thread:
+    """Run an event loop forever in a daemon thread and return once it is running."""
+    started = threading.Event()
+    loop.call_soon_threadsafe(started.set)
+    thread = threading.Thread(target=loop.run_forever, name=name, daemon=True)
+    thread.start()
+    started.wait()
+    return thread
+
 class TokenManager:
     """
     A synchronous wrapper for the asynchronous TokenManagerAsync class.
 
     This class provides a blocking, synchronous interface for acquiring and refreshing
     OAuth2 tokens, using an asyncio event loop to run the asynchronous methods of
-    TokenManagerAsync.
+    TokenManagerAsync. Calls are submitted to the loop from the calling thread, so
+    they also work while another thread is running asyncio code.
+
+    An instance can be shared between threads. Updates and refreshes are serialized
+    with a lock, while reads of the cached token take no lock, since a single attribute
+    read is atomic. The lock belongs to the async token manager, so TokenManager
+    instances wrapping the same one are serialized together.
 
     Attributes:
         _async_token_manager (TokenManagerAsync): An instance of the TokenManagerAsync class.
@@ -18,7 +38,6 @@ class TokenManager:
 
     Example usage:
         ```python
-        import asyncio
         from token_manager import TokenManager
         from token_manager_async import TokenManagerAsync
         from config import OAuth2Config
@@ -34,44 +53,66 @@ class TokenManager:
         # Step 2: Create an instance of TokenManagerAsync with the configuration
         async_token_manager = TokenManagerAsync(config)
 
-        # Step 3: Get an asyncio event loop (or create a new one)
-        loop = asyncio.get_event_loop()
+        # Step 3: Initialize the TokenManager with the async token manager. Without a loop,
+        # it creates its own and runs it in a background thread until closed
+        token_manager = TokenManager(async_token_manager=async_token_manager)
 
-        # Step 4: Initialize the TokenManager with the async token manager and the event loop
-        token_manager = TokenManager(async_token_manager=async_token_manager, loop=loop)
-
-        # Step 5: Use the TokenManager to get a valid token synchronously
+        # Step 4: Use the TokenManager to get a valid token synchronously
         token = token_manager.get_valid_token()
 
         # Output the token
         print(f"Access Token: {token}")
+
+        # Step 5: Stop the event loop owned by the TokenManager
+        token_manager.close()
         ```
     """
 
-    def __init__(self, async_token_manager: TokenManagerAsync, loop: asyncio.AbstractEventLoop):
+    __slots__ = ("_async_token_manager", "_loop", "_owns_loop", "_thread", "_sync_lock", "__weakref__")
+
+    def __init__(self, async_token_manager: TokenManagerAsync, loop: Optional[asyncio.AbstractEventLoop] = None):
         """
         Initializes the TokenManager with an async token manager and event loop.
 
         Args:
             async_token_manager (TokenManagerAsync): The asynchronous token manager responsible
                 for managing tokens.
-            loop (asyncio.AbstractEventLoop): The asyncio event loop used to run async tasks.
+            loop (Optional[asyncio.AbstractEventLoop], optional): The asyncio event loop used to run
+                async tasks. If it is not running yet, it runs in a daemon thread until `close` is
+                called. If None, a new event loop is created and owned by this TokenManager until
+                `close` is called. Defaults to None.
         """
         self._async_token_manager = async_token_manager
+        self._owns_loop = loop is None
+        if loop is None:
+            loop = asyncio.new_event_loop()
         self._loop = loop
+        self._thread = None if loop.is_running() else _run_loop_in_thread(loop, "oauth2-token-manager-loop")
+        # Shared with the other wrappers of the same async token manager, so that they serialize together
+        self._sync_lock = async_token_manager._sync_lock
 
     def get_valid_token(self) -> str:
         """
         Retrieves a valid OAuth2 token synchronously, refreshing it if necessary.
 
-        This method wraps the async get_valid_token method from TokenManagerAsync and
-        runs it in the provided event loop.
+        A cached token that is still valid is returned directly, without involving the
+        event loop. Otherwise this method submits the async get_valid_token method from
+        TokenManagerAsync to the event loop and blocks until it completes.
 
         Returns:
             str: A valid OAuth2 access token.
         """
-        future = asyncio.ensure_future(self._async_token_manager.get_valid_token(), loop=self._loop)
-        return self._loop.run_until_complete(future)
+        manager = self._async_token_manager
+        if time.monotonic() < manager.expires_at:
+            manager._used = True
+            return manager.access_token
+
+        with self._sync_lock:
+            # Another thread may have refreshed the token while this one waited for the lock
+            if time.monotonic() < manager.expires_at:
+                manager._used = True
+                return manager.access_token
+            return self._run(manager.get_valid_token())
 
     @property
     def access_token(self) -> str:
@@ -91,7 +132,8 @@ class TokenManager:
         Args:
             value (str): The new access token.
         """
-        self._async_token_manager.access_token = value
+        with self._sync_lock:
+            self._async_token_manager.access_token = value
 
     @property
     def expires_at(self) -> float:
@@ -99,7 +141,7 @@ class TokenManager:
         Accesses the expiration time of the current OAuth2 access token.
 
         Returns:
-            float: The expiration time of the token in UNIX time.
+            float: The expiration time of the token on the `time.monotonic()` clock.
         """
         return self._async_token_manager.expires_at
 
@@ -109,19 +151,70 @@ class TokenManager:
         Sets the expiration time of the current OAuth2 access token.
 
         Args:
-            value (float): The new expiration time in UNIX time.
+            value (float): The new expiration time on the `time.monotonic()` clock.
+        """
+        with self._sync_lock:
+            self._async_token_manager.expires_at = value
+
+    def invalidate(self, token: Optional[str] = None):
+        """
+        Discards the cached OAuth2 access token so that the next call to
+        `get_valid_token` refreshes it.
+
+        Args:
+            token (Optional[str], optional): The rejected token. If given, the cache is only
+                discarded while it still holds this token. Defaults to None.
         """
-        self._async_token_manager.expires_at = value
+        with self._sync_lock:
+            self._async_token_manager.invalidate(token)
 
     def refresh_token(self):
         """
         Refreshes the OAuth2 access token synchronously.
 
-        This method wraps the async refresh_token method from TokenManagerAsync and
-        runs it in the provided event loop.
+        This method submits the async refresh_token method from TokenManagerAsync to
+        the event loop and blocks until it completes.
 
         Returns:
             None
         """
-        future = asyncio.ensure_future(self._async_token_manager.refresh_token(), loop=self._loop)
-        return self._loop.run_until_complete(future)
+        with self._sync_lock:
+            return self._run(self._async_token_manager.refresh_token())
+
+    def _run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """
+        Runs a coroutine on the event loop and blocks until it completes.
+
+        Raises:
+            RuntimeError: If called from a coroutine or callback running on that event loop,
+                which would wait forever for itself.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            coro.close()
+            raise RuntimeError(
+                "TokenManager cannot block on the event loop it is running on; "
+                "await the TokenManagerAsync methods from coroutines on that loop instead"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self):
+        """
+        Stops the event loop thread started by this TokenManager, if any, and closes the
+        event loop if this TokenManager created it.
+
+        The async token manager is closed first, since its background refresh and HTTP
+        client are bound to that loop. A loop passed to the constructor is stopped but not
+        closed, and a loop that was already running is left running.
+        """
+        if self._thread is None:
+            return
+        self._run(self._async_token_manager.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        if self._owns_loop:
+            self._loop.close()
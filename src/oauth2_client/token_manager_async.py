@@ -2,24 +2,76 @@
 This module provides a class for managing OAuth2 tokens.
 """
 import base64
+import hashlib
+import os
+import tempfile
+import threading
 import time
 import asyncio
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlencode
 import httpx
 from .config import OAuth2Config
 from .exceptions import TokenRefreshError
+from . import _http, _json
+
+# Seconds before the reported expiry at which a cached token is considered stale
+EXPIRY_BUFFER = 300
+
+# Token lifetime assumed when the server does not report `expires_in`
+DEFAULT_EXPIRES_IN = 3600
+
+# Seconds before a cached token goes stale at which it is refreshed in the background
+REFRESH_AHEAD = 60
+
+# Tokens reused for less than this many seconds are only refreshed on demand
+MIN_BACKGROUND_REFRESH_LIFETIME = 60
+
+# Lower bound in seconds on the delay before a background refresh
+MIN_REFRESH_DELAY = 1
+
+# Upper bound in seconds on the delay between failed background refresh attempts
+MAX_REFRESH_BACKOFF = 60
+
+def _cache_file(config: OAuth2Config) -> Path:
+    """Return the token cache file for a configuration, named by a hash of its client and scopes."""
+    key = "\n".join([config.token_url, config.client_id, *sorted(config.scopes)])
+    return Path(config.cache_path).expanduser() / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    """Read a JSON object from a file, or return None if it is missing or unreadable."""
+    try:
+        data = _json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]):
+    """Write a JSON object to a file readable only by its owner, replacing it atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_json.dumps(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 class TokenManagerAsync:
     """
     Manages OAuth2 token acquisition and renewal.
 
     This class is responsible for obtaining and refreshing OAuth2 tokens
-    as needed for API authentication.
+    as needed for API authentication. After each refresh, the next one is scheduled
+    in the background shortly before the token goes stale, so that API calls do not
+    wait for the token endpoint.
 
     Attributes:
         config (OAuth2Config): The OAuth2 configuration.
         access_token (str): The current access token.
-        expires_at (float): The expiration time of the current token.
-        lock (asyncio.Lock): A lock for thread-safe token refresh operations.
+        expires_at (float): The `time.monotonic()` deadline after which the current token is refreshed.
 
     Example:
         ```python
@@ -29,33 +81,152 @@ class TokenManagerAsync:
         ```
     """
 
-    def __init__(self, config: OAuth2Config):
+    __slots__ = (
+        "config", "expires_at", "_access_token", "_auth_header", "_shared_client", "_client_provider",
+        "_client", "_client_loop", "_inflight", "_refresh_task", "_used", "_cache_file", "_token_headers", "_token_body", "_sync_lock", "__weakref__"
+    )
+
+    def __init__(self, config: OAuth2Config, shared_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the TokenManagerAsync.
 
         Args:
             config (OAuth2Config): The OAuth2 configuration.
+            shared_client (Optional[httpx.AsyncClient], optional): An HTTP client owned by the caller
+                to send token requests with, for example the client used for API calls, so that
+                both share connections to the same host. It is not closed by `aclose`. Defaults to None.
         """
         self.config = config
+        self._shared_client = shared_client
+        # Set by an APIClientAsync to send token requests through the connection pool it holds
+        self._client_provider: Optional[Callable[[], httpx.AsyncClient]] = None
         self.access_token = None
         self.expires_at = 0
-        self.lock = asyncio.Lock()
+        self._inflight: Optional[asyncio.Future] = None
+        self._refresh_task: Optional[asyncio.Future] = None
+        # Whether the token was handed out since it was last refreshed
+        self._used = False
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Serializes the updates and refreshes of every TokenManager wrapping this token manager
+        self._sync_lock = threading.Lock()
+        self._cache_file = _cache_file(config) if config.cache_path is not None else None
+        if self._cache_file is not None:
+            self._load_cached_token(self._cache_file)
+
+        # The client credentials never change, so the token request is built only once
+        auth = base64.b64encode(f"{config.client_id}:{config.client_secret}".encode()).decode("ascii")
+        self._token_headers = {
+            "Authorization": f"Basic {auth}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        self._token_body = urlencode({
+            "grant_type": "client_credentials",
+            "scope": " ".join(config.scopes)
+        }).encode("ascii")
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """The current access token."""
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value: Optional[str]):
+        self._access_token = value
+        # Encoded once per token rather than once per request; httpx sends bytes values as is
+        self._auth_header = b"Bearer " + value.encode("ascii") if value is not None else None
+
+    def _load_cached_token(self, path: Path):
+        """Use the token persisted by a previous process if it has not expired yet."""
+        cached = _read_json(path)
+        if cached is None:
+            return
+        try:
+            # The file holds a wall clock deadline since monotonic time is not comparable across processes
+            remaining = float(cached["expires_at"]) - time.time()
+            access_token = str(cached["access_token"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if remaining > 0:
+            self.access_token = access_token
+            self.expires_at = time.monotonic() + remaining
 
     async def get_valid_token(self) -> str:
         """
         Get a valid OAuth2 token, refreshing if necessary.
 
+        A cached token is returned without I/O while it is valid. When it has expired,
+        the first caller starts a refresh and concurrent callers await that same refresh,
+        so a single request is sent to the token endpoint and its result or error is
+        shared by all of them.
+
         Returns:
             str: A valid OAuth2 access token.
 
         Raises:
             TokenRefreshError: If token refresh fails.
         """
-        async with self.lock:
-            if time.time() >= self.expires_at:
-                await self.refresh_token()
+        if time.monotonic() < self.expires_at:
+            self._used = True
             return self.access_token
 
+        # Shielded so that a cancelled caller does not abort the refresh for the others
+        await asyncio.shield(self._start_refresh())
+        self._used = True
+        return self.access_token
+
+    def _start_refresh(self, client: Optional[httpx.AsyncClient] = None) -> asyncio.Future:
+        """
+        Return the inflight refresh, starting one if none is in progress.
+
+        Args:
+            client (Optional[httpx.AsyncClient], optional): The HTTP client for a new refresh.
+                Defaults to the client returned by `_get_client`.
+        """
+        # No await between the check and the assignment, so only one refresh is started
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._do_refresh(client))
+        return self._inflight
+
+    async def _do_refresh(self, client: Optional[httpx.AsyncClient]):
+        """Refresh the token on behalf of all callers awaiting the inflight refresh."""
+        try:
+            if client is None:
+                await self.refresh_token()
+            else:
+                await self._request_token(client)
+        finally:
+            self._inflight = None
+
+    async def get_auth_header_bytes(self) -> bytes:
+        """
+        Get the Authorization header value for a valid OAuth2 token, refreshing if necessary.
+
+        Returns:
+            bytes: The ASCII encoded header value, in the form `Bearer <token>`.
+
+        Raises:
+            TokenRefreshError: If token refresh fails.
+        """
+        if time.monotonic() >= self.expires_at:
+            await self.get_valid_token()
+        self._used = True
+        return self._auth_header
+
+    def invalidate(self, token: Optional[str] = None):
+        """
+        Discard the cached token so that the next call to `get_valid_token` refreshes it.
+
+        Use this when the server rejects a token before its reported expiry.
+
+        Args:
+            token (Optional[str], optional): The rejected token. If given, the cache is only
+                discarded while it still holds this token, so that concurrent callers rejected
+                with the same token cause a single refresh. Defaults to None.
+        """
+        if token is None or token == self.access_token:
+            self.expires_at = 0
+
     async def refresh_token(self):
         """
         Refresh the OAuth2 token.
@@ -65,21 +236,154 @@ class TokenManagerAsync:
         Raises:
             TokenRefreshError: If token refresh fails.
         """
-        auth = base64.b64encode(f"{self.config.client_id}:{self.config.client_secret}".encode()).decode()
-        headers = {
-            "Authorization": f"Basic {auth}",
-            "Content-Type": "application/x-www-form-urlencoded"
-        }
-        data = {
-            "grant_type": "client_credentials",
-            "scope": " ".join(self.config.scopes)
-        }
-        async with httpx.AsyncClient() as client:
+        client = self._get_client()
+        if client is not None:
+            await self._request_token(client)
+            return
+        async with _http.new_client(self.config.http2) as client:
+            await self._request_token(client)
+
+    def _get_client(self) -> Optional[httpx.AsyncClient]:
+        """
+        Return the HTTP client for token requests.
+
+        This is the client passed to the constructor, the connection pool held by the
+        APIClientAsync owning this token manager, or, when the pool is not shared, a client
+        owned by this token manager that is created on first use and kept open until
+        `aclose` so that refreshes reuse its connections, and replaced when the token manager
+        is used on another event loop. A standalone token manager
+        using the shared pool holds no connections between refreshes, so None is returned
+        and each refresh uses a client of its own.
+        """
+        if self._shared_client is not None:
+            return self._shared_client
+        if self._client_provider is not None:
+            return self._client_provider()
+        if self.config.shared_pool:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            if self._client is not None and self._client_loop is not None and self._client_loop is not loop:
+                _http.close_on_loop(self._client, self._client_loop)
+            self._client_loop = loop
+            self._client = httpx.AsyncClient(
+                http2=self.config.http2 and _http.HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                timeout=httpx.Timeout(10.0)
+            )
+        return self._client
+
+    async def _request_token(self, client: httpx.AsyncClient):
+        """Request a new token from the OAuth2 server using the given HTTP client."""
+        try:
+            response = await client.post(
+                self.config.token_url, headers=self._token_headers, content=self._token_body,
+                follow_redirects=False
+            )
+            response.raise_for_status()
+            token_data = _json.loads(response.content)
+            self.access_token = token_data["access_token"]
+            expires_in = token_data.get("expires_in", DEFAULT_EXPIRES_IN)
+            # Short-lived tokens are still reused for half of their lifetime
+            lifetime = max(expires_in - EXPIRY_BUFFER, expires_in / 2)
+            self.expires_at = time.monotonic() + lifetime
+            self._used = False
+        except httpx.HTTPStatusError as e:
+            raise TokenRefreshError("Failed to refresh token") from e
+
+        self._schedule_refresh(lifetime)
+
+        if self._cache_file is not None:
+            cached = {"access_token": self.access_token, "expires_at": time.time() + lifetime}
             try:
-                response = await client.post(self.config.token_url, headers=headers, data=data)
-                response.raise_for_status()
-                token_data = response.json()
-                self.access_token = token_data["access_token"]
-                self.expires_at = time.time() + token_data["expires_in"] - 60  # Refresh 1 minute before expiration
-            except httpx.HTTPStatusError as e:
-                raise TokenRefreshError(f"Failed to refresh token: {e}") from e
+                await asyncio.to_thread(_write_json_atomic, self._cache_file, cached)
+            except OSError:
+                # The cache only saves a refresh in the next process; the new token is still valid
+                pass
+
+    def _schedule_refresh(self, lifetime: float):
+        """
+        Replace the pending background refresh with one for a token reused for `lifetime` seconds.
+
+        Short-lived tokens are not refreshed in the background, since that would keep
+        requesting tokens in a tight loop.
+        """
+        self._cancel_refresh()
+        if lifetime < MIN_BACKGROUND_REFRESH_LIFETIME:
+            return
+        delay = max(lifetime - min(REFRESH_AHEAD, lifetime / 2), MIN_REFRESH_DELAY)
+        self._refresh_task = asyncio.ensure_future(self._refresh_ahead(delay))
+
+    def _cancel_refresh(self):
+        """Cancel the pending background refresh, if any."""
+        task, self._refresh_task = self._refresh_task, None
+        # A task left behind by an event loop that has since been closed can no longer be cancelled
+        if task is not None and not task.get_loop().is_closed():
+            task.cancel()
+
+    async def _refresh_ahead(self, delay: float):
+        """
+        Refresh the token in the background after `delay` seconds.
+
+        The refresh is skipped when the current token has not been used, so that a client
+        left idle or never closed stops requesting tokens after one lifetime. Failed
+        attempts are retried with exponential backoff until the token goes stale, after
+        which the next call to `get_valid_token` refreshes it on demand.
+        """
+        await asyncio.sleep(delay)
+        if not self._used:
+            return
+        backoff = 1.0
+        while True:
+            try:
+                # Joins a refresh already started by a caller that found the token stale
+                await asyncio.shield(self._start_refresh())
+                return
+            except Exception:
+                # Includes malformed token responses, which must not end the task unnoticed
+                if time.monotonic() + backoff >= self.expires_at:
+                    return
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_REFRESH_BACKOFF)
+
+    async def aclose(self):
+        """Cancel the background refresh and close the HTTP client owned by this token manager, if any."""
+        self._cancel_refresh()
+        if self._client is not None and self._client_loop is not None:
+            client, self._client = self._client, None
+            client_loop, self._client_loop = self._client_loop, None
+            if client_loop is asyncio.get_running_loop():
+                await client.aclose()
+            else:
+                _http.close_on_loop(client, client_loop)
+
+async def refresh_all(managers: Iterable[TokenManagerAsync], client: Optional[httpx.AsyncClient] = None):
+    """
+    Refresh the tokens of several token managers concurrently.
+
+    This is useful when an application talks to several tenants or providers, so that
+    their refreshes take about one round trip instead of one each. Managers owned by API
+    clients sharing a connection pool reuse connections to token endpoints on the same host. A
+    manager that is already refreshing its token is not refreshed a second time; its
+    inflight refresh is awaited instead.
+
+    Args:
+        managers (Iterable[TokenManagerAsync]): The token managers to refresh.
+        client (Optional[httpx.AsyncClient], optional): The HTTP client to send the token requests
+            with. Defaults to the client each manager uses for its own refreshes.
+
+    Raises:
+        TokenRefreshError: If any token refresh fails. The other refreshes still complete.
+
+    Example:
+        ```python
+        managers = [TokenManagerAsync(config) for config in configs]
+        await refresh_all(managers)
+        ```
+    """
+    results = await asyncio.gather(
+        *(asyncio.shield(manager._start_refresh(client)) for manager in managers), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -1,10 +1,16 @@
+import asyncio
+import concurrent.futures
+import sys
 import pytest
 import respx
 
 import httpx
 
 from oauth2_client import OAuth2Config, new_api_client
+from oauth2_client.api_client import _new_event_loop
 from oauth2_client.exceptions import TokenRefreshError, APIError
+from oauth2_client.token_manager import TokenManager
+from oauth2_client.token_manager_async import TokenManagerAsync
 
 @pytest.fixture
 def oauth2_config():
@@ -135,7 +141,7 @@ def test_different_content_types(oauth2_config, base_url):
 
 @respx.mock
 def test_token_expiration(oauth2_config, base_url, mocker):
-    mock_time = mocker.patch('time.time')
+    mock_time = mocker.patch('time.monotonic')
     mock_time.return_value = 0
 
     respx.post(oauth2_config.token_url).mock(
@@ -158,3 +164,171 @@ def test_token_expiration(oauth2_config, base_url, mocker):
         mock_time.return_value = 150
         token = client.token_manager.get_valid_token()
         assert token == "refresh_access_token"
+
+@respx.mock
+def test_api_call_inside_running_event_loop(oauth2_config, base_url):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    respx.get(f"{base_url}/api/test").mock(
+        return_value=httpx.Response(200, json={"message": "Success"})
+    )
+
+    async def main():
+        with new_api_client(oauth2_config, base_url) as client:
+            return client.call_api("GET", "/api/test")
+
+    response, status_code, _ = asyncio.run(main())
+    assert status_code == 200
+    assert response == {"message": "Success"}
+
+@respx.mock
+def test_call_api_many(oauth2_config, base_url):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    respx.get(f"{base_url}/api/test").mock(
+        return_value=httpx.Response(200, json={"message": "Success"})
+    )
+
+    with new_api_client(oauth2_config, base_url) as client:
+        results = client.call_api_many([("GET", "/api/test")] * 3)
+        assert [response for response, _, _ in results] == [{"message": "Success"}] * 3
+
+def test_uvloop_event_loop(monkeypatch):
+    uvloop = pytest.importorskip("uvloop")
+    if sys.platform == "win32":
+        pytest.skip("uvloop is not available on Windows")
+
+    monkeypatch.delenv("OAUTH2_CLIENT_NO_UVLOOP", raising=False)
+    loop = _new_event_loop()
+    assert isinstance(loop, uvloop.Loop)
+    loop.close()
+
+    # Only "1" opts out
+    for value in ("", "0", "false"):
+        monkeypatch.setenv("OAUTH2_CLIENT_NO_UVLOOP", value)
+        loop = _new_event_loop()
+        assert isinstance(loop, uvloop.Loop)
+        loop.close()
+
+    monkeypatch.setenv("OAUTH2_CLIENT_NO_UVLOOP", "1")
+    loop = _new_event_loop()
+    assert not isinstance(loop, uvloop.Loop)
+    loop.close()
+
+@respx.mock
+def test_clients_share_async_client(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    respx.get(f"{base_url}/api/test").mock(
+        return_value=httpx.Response(200, json={"message": "Success"})
+    )
+
+    first = new_api_client(oauth2_config, base_url)
+    second = new_api_client(oauth2_config, base_url)
+    assert first.async_client is second.async_client
+    # Their token managers serialize refreshes with the same lock
+    assert first.token_manager._sync_lock is second.token_manager._sync_lock
+
+    first.call_api("GET", "/api/test")
+    first.close()
+    first.close()
+
+    second.call_api("GET", "/api/test")
+    assert token_route.call_count == 1
+    second.close()
+
+    with new_api_client(oauth2_config, base_url) as third:
+        assert third.async_client is not first.async_client
+
+@respx.mock
+def test_cached_token_skips_event_loop(oauth2_config, base_url, mocker):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    with new_api_client(oauth2_config, base_url) as client:
+        assert client.token_manager.get_valid_token() == "test_access_token"
+
+        submit = mocker.spy(asyncio, "run_coroutine_threadsafe")
+        assert client.token_manager.get_valid_token() == "test_access_token"
+        assert submit.call_count == 0
+
+@respx.mock
+def test_token_manager_starts_loop(oauth2_config):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    loop = asyncio.new_event_loop()
+    token_manager = TokenManager(TokenManagerAsync(oauth2_config), loop)
+    try:
+        assert loop.is_running()
+        assert token_manager.get_valid_token() == "test_access_token"
+        token_manager.close()
+        # The thread is stopped, but the loop belongs to the caller
+        assert not loop.is_running()
+        assert not loop.is_closed()
+    finally:
+        loop.close()
+
+@respx.mock
+def test_token_manager_shared_between_threads(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    with new_api_client(oauth2_config, base_url) as client:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: client.token_manager.get_valid_token(), range(32)))
+        assert tokens == ["test_access_token"] * 32
+        assert token_route.call_count == 1
+
+@respx.mock
+def test_token_manager_owns_loop(oauth2_config):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    token_manager = TokenManager(TokenManagerAsync(oauth2_config))
+    assert token_manager.get_valid_token() == "test_access_token"
+
+    token_manager.close()
+    assert token_manager._loop.is_closed()
+    token_manager.close()
+
+def test_token_manager_called_on_its_loop(oauth2_config):
+    token_manager = TokenManager(TokenManagerAsync(oauth2_config))
+
+    async def get_valid_token():
+        return token_manager.get_valid_token()
+
+    try:
+        # Blocking on the loop from a coroutine running on it would wait forever
+        with pytest.raises(RuntimeError, match="cannot block"):
+            asyncio.run_coroutine_threadsafe(get_valid_token(), token_manager._loop).result(timeout=5)
+    finally:
+        token_manager.close()
@@ -1,8 +1,15 @@
+import asyncio
+import json
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 import respx
 import httpx
 from oauth2_client import OAuth2Config, new_api_client_async
+from oauth2_client import _http
 from oauth2_client.exceptions import TokenRefreshError, APIError
+from oauth2_client.token_manager_async import TokenManagerAsync, refresh_all
 
 @pytest.fixture
 def oauth2_config():
@@ -17,6 +24,38 @@ def oauth2_config():
 def base_url():
     return "http://api.example.com"
 
+class _LocalHandler(BaseHTTPRequestHandler):
+    """Serves a token on POST and a plain text body on GET, over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply(b"ok", "text/plain")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._reply(json.dumps({"access_token": "local_access_token", "expires_in": 3600}).encode(), "application/json")
+
+    def _reply(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LocalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_token_refresh(oauth2_config, base_url):
@@ -39,8 +78,9 @@ async def test_token_refresh_error(oauth2_config, base_url):
     )
 
     async with new_api_client_async(oauth2_config, base_url) as client:
-        with pytest.raises(TokenRefreshError):
+        with pytest.raises(TokenRefreshError) as exc_info:
             await client.token_manager.get_valid_token()
+        assert isinstance(exc_info.value.__cause__, httpx.HTTPStatusError)
 
 @pytest.mark.asyncio
 @respx.mock
@@ -140,7 +180,7 @@ async def test_different_content_types(oauth2_config, base_url):
 @pytest.mark.asyncio
 @respx.mock
 async def test_token_expiration(oauth2_config, base_url, mocker):
-    mock_time = mocker.patch('time.time')
+    mock_time = mocker.patch('time.monotonic')
     mock_time.return_value = 0
 
     respx.post(oauth2_config.token_url).mock(
@@ -164,4 +204,546 @@ async def test_token_expiration(oauth2_config, base_url, mocker):
         
         token = await client.token_manager.get_valid_token()
         assert token == "refresh_access_token"
-        
\ No newline at end of file
+        
+def test_http_client_outside_event_loop(oauth2_config, base_url):
+    client = new_api_client_async(oauth2_config, base_url)
+    with pytest.raises(RuntimeError, match="shared connection pool"):
+        client.http_client
+
+@pytest.mark.asyncio
+async def test_assign_http_client(oauth2_config, base_url):
+    http_client = httpx.AsyncClient()
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        client.http_client = http_client
+        assert client.http_client is http_client
+    assert http_client.is_closed
+
+@pytest.mark.asyncio
+async def test_shared_connection_pool(oauth2_config, base_url):
+    async with new_api_client_async(oauth2_config, base_url) as first:
+        async with new_api_client_async(None, base_url) as second:
+            pool = first.http_client
+            assert second.http_client is pool
+        # The shared pool stays open while another client still uses it
+        assert not pool.is_closed
+
+    assert pool.is_closed
+
+    oauth2_config.shared_pool = False
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        assert client.http_client is not first.http_client
+    assert client.http_client.is_closed
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_cache_and_invalidate(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={"access_token": "test_access_token"})
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.token_manager.get_valid_token()
+        await client.token_manager.get_valid_token()
+        assert token_route.call_count == 1
+
+        client.token_manager.invalidate()
+        token = await client.token_manager.get_valid_token()
+        assert token == "test_access_token"
+        assert token_route.call_count == 2
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_token_refresh(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        tokens = await asyncio.gather(*(client.token_manager.get_valid_token() for _ in range(10)))
+        assert tokens == ["test_access_token"] * 10
+        assert token_route.call_count == 1
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_download_large_file(oauth2_config, base_url, tmp_path):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    content = bytes(range(256)) * 1024
+    respx.get(f"{base_url}/api/download").mock(
+        return_value=httpx.Response(200, content=content, headers={"Content-Type": "application/octet-stream"})
+    )
+    respx.get(f"{base_url}/api/report").mock(
+        return_value=httpx.Response(200, json={"key": "value"})
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        dest_path = tmp_path / "downloaded_file.bin"
+        await client.download_file("GET", "/api/download", dest_path=dest_path)
+        assert dest_path.read_bytes() == content
+
+        dest_path = tmp_path / "report.json"
+        await client.download_file("GET", "/api/report", dest_path=dest_path)
+        assert dest_path.read_text() == '{\n  "key": "value"\n}'
+
+        assert await client.download_file("GET", "/api/report") == {"key": "value"}
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_request_body_encoding(oauth2_config, base_url):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    route = respx.post(f"{base_url}/api/items").mock(return_value=httpx.Response(201))
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.call_api("POST", "/api/items", body={"name": "item"})
+        request = route.calls.last.request
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.content) == {"name": "item"}
+
+        await client.call_api("POST", "/api/items", body={"name": "item"}, additional_headers={"Content-Type": "application/x-www-form-urlencoded"})
+        assert route.calls.last.request.content == b"name=item"
+
+        await client.call_api("POST", "/api/items", body="text")
+        request = route.calls.last.request
+        assert request.headers["Content-Type"] == "text/plain"
+        assert request.content == b"text"
+
+        await client.call_api("POST", "/api/items", body=b"\x00\x01")
+        request = route.calls.last.request
+        assert request.headers["Content-Type"] == "application/octet-stream"
+        assert request.content == b"\x00\x01"
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_authorization_header(oauth2_config, base_url):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    route = respx.get(f"{base_url}/api/test").mock(return_value=httpx.Response(200))
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.call_api("GET", "/api/test")
+        assert route.calls.last.request.headers["Authorization"] == "Bearer test_access_token"
+
+        client.token_manager.access_token = "new_token"
+        await client.call_api("GET", "/api/test")
+        assert route.calls.last.request.headers["Authorization"] == "Bearer new_token"
+
+@pytest.mark.asyncio
+async def test_http2_connection_pool(oauth2_config, base_url):
+    async with new_api_client_async(oauth2_config, base_url) as http2_client:
+        oauth2_config.http2 = False
+        async with new_api_client_async(oauth2_config, base_url) as http1_client:
+            assert http1_client.http_client is not http2_client.http_client
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_empty_json_response(base_url):
+    respx.delete(f"{base_url}/api/items/1").mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "application/json"})
+    )
+
+    async with new_api_client_async(None, base_url) as client:
+        response, status_code, _ = await client.call_api("DELETE", "/api/items/1")
+        assert status_code == 200
+        assert response is None
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_additional_headers(oauth2_config, base_url):
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    route = respx.post(f"{base_url}/api/test").mock(return_value=httpx.Response(200))
+    additional_headers = {"X-Request-Id": "42"}
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.call_api("POST", "/api/test", body="text", additional_headers=additional_headers)
+        request = route.calls.last.request
+        assert request.headers["X-Request-Id"] == "42"
+        assert request.headers["Authorization"] == "Bearer test_access_token"
+        assert additional_headers == {"X-Request-Id": "42"}
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_refresh_shares_connection_pool(oauth2_config, base_url, mocker):
+    new_client = mocker.spy(_http, "new_client")
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    respx.get(f"{base_url}/api/test").mock(return_value=httpx.Response(200))
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.call_api("GET", "/api/test")
+        assert new_client.call_count == 1
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_standalone_token_manager_holds_no_connections(oauth2_config, mocker):
+    new_client = mocker.spy(_http, "new_client")
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    token_manager = TokenManagerAsync(oauth2_config)
+    await token_manager.refresh_token()
+    # The refresh client is closed without aclose, and the shared pool is left alone
+    assert new_client.spy_return.is_closed
+    assert asyncio.get_running_loop() not in _http._shared_clients
+    await token_manager.aclose()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_call_api_many(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    respx.get(url__regex=rf"{base_url}/api/items/(?P<item>\d+)").mock(
+        side_effect=lambda request, item: httpx.Response(200, json={"item": int(item)})
+    )
+    respx.get(f"{base_url}/api/missing").mock(return_value=httpx.Response(404))
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        results = await client.call_api_many([("GET", f"/api/items/{i}") for i in range(20)], concurrency=4)
+        assert [response for response, _, _ in results] == [{"item": i} for i in range(20)]
+        assert token_route.call_count == 1
+
+        with pytest.raises(APIError):
+            await client.call_api_many([("GET", "/api/items/1"), ("GET", "/api/missing")])
+
+        with pytest.raises(ValueError):
+            await client.call_api_many([("GET", "/api/items/1")], concurrency=0)
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_content_type_parameters(base_url):
+    respx.get(f"{base_url}/api/json").mock(
+        return_value=httpx.Response(200, content=b'{"key": "value"}', headers={"Content-Type": "application/json; charset=utf-8"})
+    )
+    respx.get(f"{base_url}/api/csv").mock(
+        return_value=httpx.Response(200, content=b"a,b", headers={"Content-Type": "Text/CSV; charset=utf-8"})
+    )
+    respx.get(f"{base_url}/api/markdown").mock(
+        return_value=httpx.Response(200, content=b"# Title", headers={"Content-Type": "text/markdown"})
+    )
+
+    async with new_api_client_async(None, base_url) as client:
+        response, _, content_type = await client.call_api("GET", "/api/json")
+        assert response == {"key": "value"}
+        assert content_type == "application/json; charset=utf-8"
+
+        response, _, _ = await client.call_api("GET", "/api/csv")
+        assert response == "a,b"
+
+        response, _, _ = await client.call_api("GET", "/api/markdown")
+        assert response == "# Title"
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retry_on_unauthorized(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        side_effect=[
+            httpx.Response(200, json={"access_token": "revoked_token", "expires_in": 3600}),
+            httpx.Response(200, json={"access_token": "test_access_token", "expires_in": 3600}),
+        ]
+    )
+    respx.get(f"{base_url}/api/test").mock(
+        side_effect=lambda request: httpx.Response(200, json={"message": "Success"})
+        if request.headers["Authorization"] == "Bearer test_access_token"
+        else httpx.Response(401)
+    )
+    respx.get(f"{base_url}/api/forbidden").mock(return_value=httpx.Response(401))
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        response, status_code, _ = await client.call_api("GET", "/api/test")
+        assert status_code == 200
+        assert response == {"message": "Success"}
+        assert token_route.call_count == 2
+
+        token_route.side_effect = None
+        token_route.return_value = httpx.Response(200, json={"access_token": "test_access_token", "expires_in": 3600})
+        with pytest.raises(APIError):
+            await client.call_api("GET", "/api/forbidden")
+        assert token_route.call_count == 3
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_no_retry_for_streamed_body(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={"access_token": "test_access_token", "expires_in": 3600})
+    )
+    upload_route = respx.post(f"{base_url}/api/upload").mock(return_value=httpx.Response(401))
+
+    async def chunks():
+        yield b"first chunk"
+        yield b"second chunk"
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        # The stream is consumed by the first attempt, so it cannot be sent again
+        with pytest.raises(APIError):
+            await client.call_api("POST", "/api/upload", chunks())
+        assert upload_route.call_count == 1
+        assert token_route.call_count == 1
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_refresh_reuses_client(oauth2_config, base_url):
+    oauth2_config.shared_pool = False
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    token_manager = TokenManagerAsync(oauth2_config)
+    await token_manager.refresh_token()
+    token_client = token_manager._client
+    await token_manager.refresh_token()
+    assert token_manager._client is token_client
+
+    await token_manager.aclose()
+    assert token_client.is_closed
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_refresh_uses_api_client_pool(oauth2_config, base_url):
+    oauth2_config.shared_pool = False
+    respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.token_manager.refresh_token()
+        assert client.token_manager._get_client() is client.http_client
+        assert client.token_manager._client is None
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_token_refresh_error(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(400, json={"error": "invalid_client"})
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        results = await asyncio.gather(
+            *(client.token_manager.get_valid_token() for _ in range(10)),
+            return_exceptions=True
+        )
+        assert all(isinstance(result, TokenRefreshError) for result in results)
+        assert token_route.call_count == 1
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_disk_cache(oauth2_config, base_url, tmp_path):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+    oauth2_config.cache_path = tmp_path
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        assert await client.token_manager.get_valid_token() == "test_access_token"
+
+    cache_files = list(tmp_path.iterdir())
+    assert len(cache_files) == 1
+    assert cache_files[0].stat().st_mode & 0o777 == 0o600
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        assert await client.token_manager.get_valid_token() == "test_access_token"
+    assert token_route.call_count == 1
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_proactive_token_refresh(oauth2_config, base_url, mocker):
+    mocker.patch("oauth2_client.token_manager_async.REFRESH_AHEAD", 0.05)
+    mocker.patch("oauth2_client.token_manager_async.MIN_BACKGROUND_REFRESH_LIFETIME", 0)
+    mocker.patch("oauth2_client.token_manager_async.MIN_REFRESH_DELAY", 0.01)
+    token_route = respx.post(oauth2_config.token_url).mock(
+        side_effect=[
+            httpx.Response(200, json={"access_token": "first_token", "expires_in": 0.1}),
+            httpx.Response(200, json={"access_token": "second_token", "expires_in": 3600})
+        ]
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        assert await client.token_manager.get_valid_token() == "first_token"
+        await asyncio.sleep(0.1)
+        assert token_route.call_count == 2
+        assert client.token_manager.access_token == "second_token"
+        assert client.token_manager._refresh_task is not None
+    assert client.token_manager._refresh_task is None
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_request_body(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={
+            "access_token": "test_access_token",
+            "expires_in": 3600
+        })
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.token_manager.refresh_token()
+
+    request = token_route.calls.last.request
+    assert request.headers["Content-Type"] == "application/x-www-form-urlencoded"
+    assert request.content == b"grant_type=client_credentials&scope=api%3Aread+api%3Awrite"
+
+def test_token_manager_slots(oauth2_config):
+    token_manager = TokenManagerAsync(oauth2_config)
+    assert not hasattr(token_manager, "__dict__")
+    assert weakref.ref(token_manager)() is token_manager
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_refresh_all(oauth2_config):
+    other_config = OAuth2Config(
+        token_url="http://auth.example.com/token",
+        client_id="other_client_id",
+        client_secret="other_client_secret",
+        scopes=["api:read"],
+        shared_pool=False
+    )
+    first_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={"access_token": "first_token", "expires_in": 3600})
+    )
+    respx.post(other_config.token_url).mock(
+        return_value=httpx.Response(200, json={"access_token": "second_token", "expires_in": 3600})
+    )
+
+    managers = [TokenManagerAsync(oauth2_config), TokenManagerAsync(other_config)]
+    # A refresh already in flight is joined rather than repeated
+    await asyncio.gather(managers[0].get_valid_token(), refresh_all(managers))
+    assert [manager.access_token for manager in managers] == ["first_token", "second_token"]
+    assert first_route.call_count == 1
+    # Each manager sends its token requests through its own client
+    assert managers[1]._client is not None
+    for manager in managers:
+        await manager.aclose()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_no_background_refresh_for_short_lived_tokens(oauth2_config, base_url):
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={"access_token": "test_access_token", "expires_in": 0})
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        assert await client.token_manager.get_valid_token() == "test_access_token"
+        assert client.token_manager._refresh_task is None
+        await asyncio.sleep(0.1)
+        assert token_route.call_count == 1
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_background_refresh_stops_when_idle(oauth2_config, base_url, mocker):
+    mocker.patch("oauth2_client.token_manager_async.REFRESH_AHEAD", 0.05)
+    mocker.patch("oauth2_client.token_manager_async.MIN_BACKGROUND_REFRESH_LIFETIME", 0)
+    mocker.patch("oauth2_client.token_manager_async.MIN_REFRESH_DELAY", 0.01)
+    token_route = respx.post(oauth2_config.token_url).mock(
+        return_value=httpx.Response(200, json={"access_token": "test_access_token", "expires_in": 0.1})
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.token_manager.get_valid_token()
+        await asyncio.sleep(0.2)
+        # The token refreshed in the background is never used, so no further refresh follows it
+        assert token_route.call_count == 2
+        assert client.token_manager._refresh_task.done()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_background_refresh_malformed_response(oauth2_config, base_url, mocker):
+    mocker.patch("oauth2_client.token_manager_async.REFRESH_AHEAD", 0.05)
+    mocker.patch("oauth2_client.token_manager_async.MIN_BACKGROUND_REFRESH_LIFETIME", 0)
+    mocker.patch("oauth2_client.token_manager_async.MIN_REFRESH_DELAY", 0.01)
+    respx.post(oauth2_config.token_url).mock(
+        side_effect=[
+            httpx.Response(200, json={"access_token": "test_access_token", "expires_in": 0.1}),
+            httpx.Response(200, json={})
+        ]
+    )
+
+    async with new_api_client_async(oauth2_config, base_url) as client:
+        await client.token_manager.get_valid_token()
+        refresh_task = client.token_manager._refresh_task
+        await asyncio.sleep(0.1)
+        assert refresh_task.done()
+        assert refresh_task.exception() is None
+
+# The connection of the first loop is abandoned when that loop is closed without closing the client
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_client_reused_across_event_loops(local_server):
+    config = OAuth2Config(
+        token_url=f"{local_server}/token",
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        scopes=["api:read"]
+    )
+    client = new_api_client_async(config, local_server)
+
+    async def call_api(close):
+        try:
+            return await client.call_api("GET", "/api/test")
+        finally:
+            if close:
+                await client.close()
+
+    # A new event loop per run, as with successive asyncio.run() calls
+    for close in (False, True):
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(call_api(close)) == ("ok", 200, "text/plain")
+        finally:
+            loop.close()
+
+    config.shared_pool = False
+    token_manager = TokenManagerAsync(config)
+
+    async def refresh_token(close):
+        try:
+            await token_manager.refresh_token()
+        finally:
+            if close:
+                await token_manager.aclose()
+
+    for close in (False, True):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(refresh_token(close))
+        finally:
+            loop.close()
+    assert token_manager.access_token == "local_access_token"